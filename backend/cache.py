@@ -0,0 +1,271 @@
+"""Cache backends for graph topologies and policy decisions.
+
+Each uvicorn worker is its own process, so the in-process backend gives
+every worker a separate cache. The SQLite backend stores entries in a file
+on the local disk that all workers on the host share, so an entry is stored
+once per host and a decision made by one worker is visible to the others.
+"""
+
+import array
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Handle imports for both local development and Vercel deployment
+try:
+    from backend.models import Node, Edge, NextNodeRequest
+except ImportError:
+    from models import Node, Edge, NextNodeRequest
+
+
+# Namespaces carry a format version: bump it when the cached values or the
+# way keys are computed change, so stale entries in a persistent backend
+# are never read
+TOPOLOGY_NAMESPACE = "topology-v1"
+DECISION_NAMESPACE = "decision-v2"
+
+
+class CacheBackend(ABC):
+    """Abstract key-value cache, partitioned into namespaces such as "decision"."""
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            namespace: The cache namespace
+            key: The key within the namespace
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        pass
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any):
+        """
+        Store a value, evicting old entries of the namespace if it is full.
+
+        Args:
+            namespace: The cache namespace
+            key: The key within the namespace
+            value: The value to cache (must be picklable for shared backends)
+        """
+        pass
+
+
+class NullCache(CacheBackend):
+    """Cache that stores nothing, for disabling caching."""
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, namespace: str, key: str, value: Any):
+        pass
+
+
+class InProcessCache(CacheBackend):
+    """LRU cache held in the memory of the current process."""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries: Maximum number of entries kept per namespace
+        """
+        self.max_entries = max_entries
+        self._namespaces: Dict[str, OrderedDict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries is None or key not in entries:
+                return None
+            entries.move_to_end(key)
+            return entries[key]
+
+    def set(self, namespace: str, key: str, value: Any):
+        with self._lock:
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache stored in a SQLite file shared by all processes on the host.
+
+    Values are pickled, so the database must not be writable by other users.
+    The default location is a directory private to the current user.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 4096):
+        """
+        Args:
+            path: Database file path (defaults to a per-user temp directory)
+            max_entries: Maximum number of entries kept per namespace
+
+        Raises:
+            ValueError: If the default cache directory is owned by another user
+        """
+        if path is None:
+            directory = os.path.join(tempfile.gettempdir(), f"snowplow-cache-{os.getuid()}")
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if os.stat(directory).st_uid != os.getuid():
+                raise ValueError(f"Cache directory {directory} is owned by another user")
+            path = os.path.join(directory, "cache.sqlite3")
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " created REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (namespace, created)")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any):
+        conn = self._connection()
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with conn:
+            # Entries are keyed by content, so the first writer wins and
+            # other workers storing the same key don't rewrite it
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+                (namespace, key, data, time.time())
+            ).rowcount
+            if inserted:
+                conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                    " SELECT key FROM cache WHERE namespace = ?"
+                    " ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (namespace, namespace, self.max_entries)
+                )
+
+
+class TieredCache(CacheBackend):
+    """
+    In-process cache in front of a shared backend.
+
+    For values that are read on every request, such as graph topologies,
+    where unpickling from the shared backend each time would cost more than
+    it saves.
+    """
+
+    def __init__(self, shared: CacheBackend, max_local_entries: int = 16):
+        """
+        Args:
+            shared: The backend shared between processes
+            max_local_entries: Maximum number of entries kept in-process per namespace
+        """
+        self.shared = shared
+        self._local = InProcessCache(max_local_entries)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        value = self._local.get(namespace, key)
+        if value is None:
+            value = self.shared.get(namespace, key)
+            if value is not None:
+                self._local.set(namespace, key, value)
+        return value
+
+    def set(self, namespace: str, key: str, value: Any):
+        self._local.set(namespace, key, value)
+        self.shared.set(namespace, key, value)
+
+
+def topology_cache_key(nodes: List[Node], edges: List[Edge]) -> str:
+    """
+    Compute a content-based cache key for the topology of a graph.
+
+    Returns:
+        A key identifying the nodes and edges in order, ignoring snow depths
+    """
+    # With a fixed protocol, pickling tuples of strings and floats is
+    # deterministic across processes and Python versions, and several times
+    # faster than dumping the models to JSON
+    data = pickle.dumps(
+        (
+            [(node.id, node.x, node.y) for node in nodes],
+            [(edge.id, edge.from_node, edge.to_node, edge.travel_time, edge.length) for edge in edges]
+        ),
+        protocol=4
+    )
+    return hashlib.sha256(data).hexdigest()
+
+
+def decision_cache_key(request: NextNodeRequest, topology_key: str, policy_fingerprint: str) -> str:
+    """
+    Compute a content-based cache key for a /next_node decision.
+
+    Args:
+        request: The /next_node request
+        topology_key: topology_cache_key of the request's nodes and edges
+        policy_fingerprint: cache_fingerprint() of the requested policy
+
+    Returns:
+        A key identifying the graph, snow depths, plow, context and policy
+        (including its code and configuration) of the request
+    """
+    digest = hashlib.sha256(topology_key.encode("ascii"))
+    digest.update(array.array("d", [edge.snow_depth for edge in request.edges]).tobytes())
+    digest.update(request.model_dump_json(include={"plow", "context", "policy"}).encode("utf-8"))
+    digest.update(policy_fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+def get_cache_backend(name: str, path: Optional[str] = None) -> CacheBackend:
+    """
+    Create a cache backend by name.
+
+    Args:
+        name: One of "none", "memory" or "sqlite"
+        path: Database path for the "sqlite" backend (ignored by the others)
+
+    Returns:
+        The cache backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == "none":
+        return NullCache()
+    if name == "memory":
+        return InProcessCache()
+    if name == "sqlite":
+        return SQLiteCache(path)
+    raise ValueError(f"Cache backend '{name}' not found. Available backends: none, memory, sqlite")
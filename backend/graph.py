@@ -1,28 +1,97 @@
 """GraphState domain class for managing graph structure and queries."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 # Handle imports for both local development and Vercel deployment
 try:
     from backend.models import Node, Edge
+    from backend.reward_index import RewardIndex, edge_reward
 except ImportError:
     from models import Node, Edge
+    from reward_index import RewardIndex, edge_reward
+
+
+class GraphTopology:
+    """
+    The static part of a graph: which nodes the edges connect, and how long
+    the edges are and take to traverse. Snow depths are not included.
+    
+    The simulator resends the same roads with every request, so a topology
+    can be built once, cached and shared between requests. It only holds
+    plain lists and dicts so it pickles quickly for shared cache backends.
+    """
+    
+    def __init__(self, nodes: List[Node], edges: List[Edge]):
+        """
+        Build and validate the topology of a graph.
+        
+        Args:
+            nodes: List of Node objects
+            edges: List of Edge objects (snow depths are ignored)
+            
+        Raises:
+            ValueError: If edges reference nodes that don't exist
+        """
+        self.node_ids: List[str] = [node.id for node in nodes]
+        self.edge_ids: List[str] = [edge.id for edge in edges]
+        
+        # Adjacency map for undirected graph, with and without edge IDs
+        self.adjacency: Dict[str, List[str]] = {node_id: [] for node_id in self.node_ids}
+        self.incidence: Dict[str, List[Tuple[str, str]]] = {node_id: [] for node_id in self.node_ids}
+        
+        # Edge lookup by (from_node, to_node) in both directions
+        self.edge_lookup: Dict[Tuple[str, str], str] = {}
+        
+        self.travel_times: Dict[str, float] = {}
+        self.lengths: Dict[str, float] = {}
+        
+        # Validate edges and build adjacency maps
+        for edge in edges:
+            if edge.from_node not in self.adjacency:
+                raise ValueError(f"Edge {edge.id} references non-existent node: {edge.from_node}")
+            if edge.to_node not in self.adjacency:
+                raise ValueError(f"Edge {edge.id} references non-existent node: {edge.to_node}")
+            
+            # Add both directions since graph is undirected
+            self.adjacency[edge.from_node].append(edge.to_node)
+            self.adjacency[edge.to_node].append(edge.from_node)
+            self.incidence[edge.from_node].append((edge.to_node, edge.id))
+            self.incidence[edge.to_node].append((edge.from_node, edge.id))
+            self.edge_lookup[(edge.from_node, edge.to_node)] = edge.id
+            self.edge_lookup[(edge.to_node, edge.from_node)] = edge.id
+            
+            self.travel_times[edge.id] = edge.travel_time
+            self.lengths[edge.id] = edge.length
 
 
 class GraphState:
     """Domain class that manages graph structure and provides neighbor queries."""
     
-    def __init__(self, nodes: List[Node], edges: List[Edge]):
+    def __init__(
+        self,
+        nodes: List[Node],
+        edges: List[Edge],
+        reward_cell_size: Optional[float] = None,
+        topology: Optional[GraphTopology] = None
+    ):
         """
         Initialize the graph state with nodes and edges.
         
         Args:
             nodes: List of Node objects
             edges: List of Edge objects
+            reward_cell_size: Grid cell size for partitioning the reward index
+                spatially (None for a single region)
+            topology: Cached topology of these nodes and edges, in the same
+                order (built and validated from them when None)
             
         Raises:
             ValueError: If edges reference nodes that don't exist
         """
+        if topology is None:
+            topology = GraphTopology(nodes, edges)
+        self.topology = topology
+        
         # Store nodes in a dictionary for O(1) lookup
         self._nodes: Dict[str, Node] = {node.id: node for node in nodes}
         
@@ -30,19 +99,15 @@ class GraphState:
         self._edges: List[Edge] = edges
         self._edges_by_id: Dict[str, Edge] = {edge.id: edge for edge in edges}
         
-        # Build adjacency map for undirected graph
-        self._adjacency: Dict[str, List[str]] = {node.id: [] for node in nodes}
+        # Current snow depths, owned by this graph so updates never touch
+        # the Edge objects, which belong to the request
+        self._snow_depths: Dict[str, float] = {edge.id: edge.snow_depth for edge in edges}
         
-        # Validate edges and build adjacency map
-        for edge in edges:
-            if edge.from_node not in self._nodes:
-                raise ValueError(f"Edge {edge.id} references non-existent node: {edge.from_node}")
-            if edge.to_node not in self._nodes:
-                raise ValueError(f"Edge {edge.id} references non-existent node: {edge.to_node}")
-            
-            # Add both directions since graph is undirected
-            self._adjacency[edge.from_node].append(edge.to_node)
-            self._adjacency[edge.to_node].append(edge.from_node)
+        self._adjacency = topology.adjacency
+        
+        # Reward index is built on first use, most requests never need it
+        self._reward_cell_size = reward_cell_size
+        self._reward_index: Optional[RewardIndex] = None
     
     def get_neighbors(self, node_id: str) -> List[str]:
         """
@@ -94,6 +159,9 @@ class GraphState:
         """
         Get all edges in the graph.
         
+        The snow_depth of the Edge objects is the one the graph was created
+        with; use get_snow_depths() for the current depths.
+        
         Returns:
             List of all Edge objects
         """
@@ -115,4 +183,60 @@ class GraphState:
         if edge_id not in self._edges_by_id:
             raise KeyError(f"Edge {edge_id} not found in graph")
         return self._edges_by_id[edge_id]
-
+    
+    def get_snow_depth(self, edge_id: str) -> float:
+        """
+        Get the current snow depth of an edge.
+        
+        Args:
+            edge_id: The ID of the edge
+            
+        Returns:
+            The snow depth
+            
+        Raises:
+            KeyError: If edge_id doesn't exist in the graph
+        """
+        if edge_id not in self._snow_depths:
+            raise KeyError(f"Edge {edge_id} not found in graph")
+        return self._snow_depths[edge_id]
+    
+    def get_snow_depths(self) -> Dict[str, float]:
+        """
+        Get the current snow depths of all edges.
+        
+        Returns:
+            Dict mapping edge_id to snow depth (read-only; use update_snow_depth)
+        """
+        return self._snow_depths
+    
+    def update_snow_depth(self, edge_id: str, snow_depth: float):
+        """
+        Set the snow depth of an edge, keeping the reward index up to date.
+        
+        Args:
+            edge_id: The ID of the edge
+            snow_depth: The new snow depth (negative depths count as no snow)
+            
+        Raises:
+            KeyError: If edge_id doesn't exist in the graph
+        """
+        if edge_id not in self._snow_depths:
+            raise KeyError(f"Edge {edge_id} not found in graph")
+        self._snow_depths[edge_id] = snow_depth
+        if self._reward_index is not None:
+            self._reward_index.update(edge_id, edge_reward(snow_depth, self.topology.lengths[edge_id]))
+    
+    @property
+    def reward_index(self) -> RewardIndex:
+        """
+        Index of edge rewards (snow_depth * length) for top-k and total queries.
+        
+        Built on first access from the current snow depths and updated by
+        update_snow_depth().
+        """
+        if self._reward_index is None:
+            self._reward_index = RewardIndex(
+                self._nodes, self._edges, self._reward_cell_size, self._snow_depths
+            )
+        return self._reward_index
@@ -0,0 +1,222 @@
+"""Replay recorded /next_node traces against the routing API.
+
+Record a trace by starting the server with TRACE_RECORD_PATH set, then
+replay it from the project root:
+
+    python -m backend.loadgen traces/next_node.jsonl.gz --mode asgi --concurrency 8
+    python -m backend.loadgen traces/next_node.jsonl.gz --mode uvicorn --rate 50
+    python -m backend.loadgen traces/next_node.jsonl.gz --url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import httpx
+
+# Handle imports for both local development and Vercel deployment
+try:
+    from backend.request_trace import read_trace
+except ImportError:
+    from request_trace import read_trace
+
+
+@dataclass
+class ReplayReport:
+    """Throughput, latency and error summary of a replay run."""
+    requests: int
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.requests if self.requests else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank latency percentile in seconds (0.0 when no requests succeeded)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "duration_s": self.duration,
+            "throughput_rps": self.throughput,
+            "latency_ms": {
+                "p50": self.percentile(50) * 1000,
+                "p90": self.percentile(90) * 1000,
+                "p99": self.percentile(99) * 1000,
+                "p999": self.percentile(99.9) * 1000,
+                "max": max(self.latencies, default=0.0) * 1000,
+            },
+            "error_rate": self.error_rate,
+            "errors": self.errors,
+        }
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    payloads: List[Dict],
+    concurrency: int = 1,
+    rate: float = 0.0
+) -> ReplayReport:
+    """
+    Send recorded /next_node payloads and measure the responses.
+
+    Args:
+        client: HTTP client whose base URL points at the API
+        payloads: Request bodies in the order they should be sent
+        concurrency: Maximum number of requests in flight
+        rate: Target requests per second (0 sends as fast as concurrency allows)
+
+    Returns:
+        ReplayReport for the run
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: Counter = Counter()
+
+    async def send(payload: Dict, start: float):
+        try:
+            try:
+                response = await client.post("/next_node", json=payload)
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+                return
+            latency = time.perf_counter() - start
+            if response.is_success:
+                latencies.append(latency)
+            else:
+                errors[str(response.status_code)] += 1
+        finally:
+            semaphore.release()
+
+    tasks = []
+    run_start = time.perf_counter()
+    for i, payload in enumerate(payloads):
+        if rate > 0:
+            # Open-loop pacing: request i is due at run_start + i / rate, and
+            # its latency counts from then, including any wait for a free slot
+            scheduled = run_start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await semaphore.acquire()
+        else:
+            await semaphore.acquire()
+            scheduled = time.perf_counter()
+        tasks.append(asyncio.create_task(send(payload, scheduled)))
+    await asyncio.gather(*tasks)
+    duration = time.perf_counter() - run_start
+
+    return ReplayReport(
+        requests=len(payloads),
+        duration=duration,
+        latencies=latencies,
+        errors=dict(errors)
+    )
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _run(args: argparse.Namespace) -> ReplayReport:
+    payloads = [entry["payload"] for entry in read_trace(args.trace)]
+    if args.limit:
+        payloads = payloads[:args.limit]
+    payloads = payloads * args.loops
+
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            return await replay(client, payloads, args.concurrency, args.rate)
+
+    # main.py prints startup diagnostics; keep stdout clean for --json
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            from backend.main import app
+        except ImportError:
+            from main import app
+
+    if args.mode == "asgi":
+        # Server errors become 500 responses instead of aborting the replay
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=timeout) as client:
+            return await replay(client, payloads, args.concurrency, args.rate)
+
+    # Run uvicorn on a free localhost port in a background thread
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        await asyncio.sleep(0.05)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            return await replay(client, payloads, args.concurrency, args.rate)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded /next_node trace against the routing API")
+    parser.add_argument("trace", help="Trace file written with TRACE_RECORD_PATH")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi",
+                        help="Run the app in-process through ASGI, or behind a local uvicorn server")
+    parser.add_argument("--url", help="Replay against an already running server instead (overrides --mode)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Maximum requests in flight")
+    parser.add_argument("--rate", type=float, default=0.0, help="Target requests per second (0 = unthrottled)")
+    parser.add_argument("--limit", type=int, default=0, help="Only replay the first N recorded requests")
+    parser.add_argument("--loops", type=int, default=1, help="Replay the trace this many times")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    report = asyncio.run(_run(args))
+    summary = report.to_dict()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    latency = summary["latency_ms"]
+    print(f"Requests:    {report.requests} in {report.duration:.2f}s")
+    print(f"Throughput:  {report.throughput:.1f} req/s")
+    print(f"Latency:     p50 {latency['p50']:.1f}ms  p90 {latency['p90']:.1f}ms  "
+          f"p99 {latency['p99']:.1f}ms  p99.9 {latency['p999']:.1f}ms  max {latency['max']:.1f}ms")
+    print(f"Errors:      {sum(report.errors.values())} ({report.error_rate:.2%})")
+    for kind, count in sorted(report.errors.items()):
+        print(f"  {kind}: {count}")
+
+
+if __name__ == "__main__":
+    main()
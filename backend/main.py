@@ -1,3 +1,4 @@
+import atexit
 import os
 import sys
 from fastapi import FastAPI, HTTPException
@@ -9,13 +10,23 @@ from dotenv import load_dotenv
 # If backend is the root (Vercel), import directly
 try:
     from backend.models import NextNodeRequest, NextNodeResponse
-    from backend.graph import GraphState
+    from backend.graph import GraphState, GraphTopology
     from backend.policies import get_policy
+    from backend.request_trace import TraceRecorder
+    from backend.cache import (
+        get_cache_backend, NullCache, SQLiteCache, TieredCache, TOPOLOGY_NAMESPACE, DECISION_NAMESPACE,
+        topology_cache_key, decision_cache_key
+    )
 except ImportError:
     # Fallback for Vercel deployment where backend is the root
     from models import NextNodeRequest, NextNodeResponse
-    from graph import GraphState
+    from graph import GraphState, GraphTopology
     from policies import get_policy
+    from request_trace import TraceRecorder
+    from cache import (
+        get_cache_backend, NullCache, SQLiteCache, TieredCache, TOPOLOGY_NAMESPACE, DECISION_NAMESPACE,
+        topology_cache_key, decision_cache_key
+    )
 
 # Load environment variables from .env file (if it exists)
 load_dotenv()
@@ -50,6 +61,31 @@ app.add_middleware(
 )
 
 
+# Record incoming /next_node requests for replay with backend/loadgen.py
+# Set TRACE_RECORD_PATH (e.g. "traces/next_node.{pid}.jsonl.gz") to enable
+trace_record_path = os.getenv("TRACE_RECORD_PATH")
+trace_recorder = TraceRecorder(trace_record_path) if trace_record_path else None
+if trace_recorder is not None:
+    print(f"Recording /next_node requests to: {trace_recorder.path}")
+    atexit.register(trace_recorder.close)
+
+
+# Cache for graph topologies (everything but snow depths). The simulator
+# resends the same roads every tick, so the topology is built once.
+# TOPOLOGY_CACHE_BACKEND: "memory" (per worker process, default), "sqlite"
+# (shared by all workers on the host, stored at CACHE_PATH) or "none"
+topology_cache = get_cache_backend(os.getenv("TOPOLOGY_CACHE_BACKEND", "memory"), os.getenv("CACHE_PATH"))
+if isinstance(topology_cache, SQLiteCache):
+    topology_cache = TieredCache(topology_cache)
+print(f"Topology cache backend: {type(topology_cache).__name__}")
+
+# Cache for policy decisions. Snow changes every tick, so simulator requests
+# rarely repeat and decision caching is off by default.
+# CACHE_BACKEND: "none" (default), "memory" or "sqlite", as above
+decision_cache = get_cache_backend(os.getenv("CACHE_BACKEND", "none"), os.getenv("CACHE_PATH"))
+print(f"Decision cache backend: {type(decision_cache).__name__}")
+
+
 @app.get("/")
 async def root():
     return {"message": "Snow Plow Routing API"}
@@ -61,7 +97,7 @@ async def health():
 
 
 @app.post("/next_node", response_model=NextNodeResponse)
-async def next_node(request: NextNodeRequest) -> NextNodeResponse:
+def next_node(request: NextNodeRequest) -> NextNodeResponse:
     """
     Determine the next node for a snow plow to move toward.
     
@@ -77,9 +113,17 @@ async def next_node(request: NextNodeRequest) -> NextNodeResponse:
     Raises:
         HTTPException: 400 for invalid policy, 404 for node not found, 422 for graph errors
     """
+    if trace_recorder is not None:
+        trace_recorder.record(request)
+    
     try:
-        # Build GraphState from request
-        graph = GraphState(nodes=request.nodes, edges=request.edges)
+        # Build GraphState from request, reusing the cached topology
+        topology_key = topology_cache_key(request.nodes, request.edges)
+        topology = topology_cache.get(TOPOLOGY_NAMESPACE, topology_key)
+        if topology is None:
+            topology = GraphTopology(request.nodes, request.edges)
+            topology_cache.set(TOPOLOGY_NAMESPACE, topology_key, topology)
+        graph = GraphState(nodes=request.nodes, edges=request.edges, topology=topology)
     except ValueError as e:
         raise HTTPException(
             status_code=422,
@@ -102,6 +146,18 @@ async def next_node(request: NextNodeRequest) -> NextNodeResponse:
             detail=str(e)
         )
     
+    decision_key = None
+    if policy.cacheable and not isinstance(decision_cache, NullCache):
+        decision_key = decision_cache_key(request, topology_key, policy.cache_fingerprint())
+    if decision_key is not None:
+        cached = decision_cache.get(DECISION_NAMESPACE, decision_key)
+        if cached is not None:
+            target_node_id, debug_info = cached
+            return NextNodeResponse(
+                target_node_id=target_node_id,
+                debug_info=debug_info
+            )
+    
     # Call policy to choose next node
     try:
         target_node_id, debug_info = policy.choose_next_node(
@@ -120,6 +176,9 @@ async def next_node(request: NextNodeRequest) -> NextNodeResponse:
             detail=f"Node not found: {str(e)}"
         )
     
+    if decision_key is not None:
+        decision_cache.set(DECISION_NAMESPACE, decision_key, (target_node_id, debug_info))
+    
     return NextNodeResponse(
         target_node_id=target_node_id,
         debug_info=debug_info
@@ -1,5 +1,6 @@
 """Policy registry for snow plow routing."""
 
+import os
 from typing import Dict
 
 # Handle imports for both local development and Vercel deployment
@@ -13,12 +14,28 @@ except ImportError:
     from policies.finite_horizon_greedy import FiniteHorizonGreedyPolicy
 
 
+# Lookahead horizon of the parallel policy (in seconds); long enough that
+# searches outgrow a single core
+PARALLEL_T_MAX = float(os.getenv("PARALLEL_T_MAX", "180"))
+
+# Search processes per uvicorn worker. By default the cores are divided
+# between the WEB_CONCURRENCY uvicorn workers so they don't oversubscribe
+# the host
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "0")) or max(
+    1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1"))
+)
+
+
 # Policy registry mapping policy names to instances
 POLICY_REGISTRY: Dict[str, BasePolicy] = {
     "naive": NaivePolicy(),
     "finite_horizon_greedy": FiniteHorizonGreedyPolicy(
         T_max=60.0  # 2 minute lookahead horizon (in seconds)
     ),
+    "finite_horizon_greedy_parallel": FiniteHorizonGreedyPolicy(
+        T_max=PARALLEL_T_MAX,
+        workers=SEARCH_WORKERS
+    ),
 }
 
 
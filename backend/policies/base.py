@@ -1,5 +1,7 @@
+import hashlib
+import inspect
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 # Handle imports for both local development and Vercel deployment
 try:
@@ -13,6 +15,31 @@ except ImportError:
 class BasePolicy(ABC):
     """Abstract base class for routing policies."""
     
+    # Whether the same request always produces the same decision, so the
+    # decision can be cached and shared between workers
+    cacheable: bool = True
+    
+    _cache_fingerprint: Optional[str] = None
+    
+    def cache_fingerprint(self) -> str:
+        """
+        Identify the policy's code and configuration for decision cache keys.
+        
+        Decisions cached in a persistent backend must not outlive a deploy
+        that changes how the policy decides, so the fingerprint covers the
+        source of the policy's module and its public attributes.
+        
+        Returns:
+            A hex digest, computed once per policy instance
+        """
+        if self._cache_fingerprint is None:
+            config = sorted((k, repr(v)) for k, v in vars(self).items() if not k.startswith("_"))
+            digest = hashlib.sha256(type(self).__qualname__.encode("utf-8"))
+            digest.update(inspect.getsource(inspect.getmodule(type(self))).encode("utf-8"))
+            digest.update(repr(config).encode("utf-8"))
+            self._cache_fingerprint = digest.hexdigest()
+        return self._cache_fingerprint
+    
     @abstractmethod
     def choose_next_node(
         self,
@@ -1,6 +1,17 @@
 """Finite horizon greedy policy for snow plow routing."""
 
-from typing import Dict, Tuple, List, Set
+import hashlib
+import heapq
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Tuple, List, Set, Optional
 
 # Handle imports for both local development and Vercel deployment
 try:
@@ -21,9 +32,24 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
     The algorithm explores all possible paths from the current node that fit
     within the time budget (T_max), and selects the next node on the path
     that maximizes total_reward / total_time.
+    
+    Subtrees that cannot beat the best ratio found so far are pruned. With
+    workers > 1, the search tree is split into subtrees that are searched in
+    order in-process until parallel_min_nodes DFS nodes have been visited;
+    the remaining subtrees go to a long-lived pool of worker processes that
+    share the best ratio for pruning. The result is identical to the serial
+    search.
     """
     
-    def __init__(self, T_max: float = 60.0, default_snow: float = 1.0, default_importance: float = 1.0):
+    def __init__(
+        self,
+        T_max: float = 60.0,
+        default_snow: float = 1.0,
+        default_importance: float = 1.0,
+        workers: int = 1,
+        tasks_per_worker: int = 4,
+        parallel_min_nodes: int = 50_000
+    ):
         """
         Initialize the finite horizon greedy policy.
         
@@ -31,10 +57,20 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
             T_max: Maximum time horizon for path exploration
             default_snow: Default snow amount for edges (if not provided in context)
             default_importance: Default importance for edges (if not provided in context)
+            workers: Number of worker processes for the search (1 runs serially)
+            tasks_per_worker: The search tree is split deep enough to give each
+                worker process at least this many subtrees, to balance the load
+            parallel_min_nodes: Searches that finish in-process within this many
+                DFS nodes never use the worker pool
         """
+        if tasks_per_worker < 1:
+            raise ValueError(f"tasks_per_worker must be at least 1, got {tasks_per_worker}")
         self.T_max = T_max
         self.default_snow = default_snow
         self.default_importance = default_importance
+        self.workers = max(1, workers)
+        self.tasks_per_worker = tasks_per_worker
+        self.parallel_min_nodes = parallel_min_nodes
     
     def choose_next_node(
         self,
@@ -66,20 +102,32 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
             raise ValueError(f"Node {start_node} has no neighbors")
         
         # Run the finite horizon greedy algorithm
-        best_ratio, best_path = self._best_path_ratio(
-            start_node,
-            self.T_max,
-            neighbors_map,
-            time_map,
-            snow_map,
-            importance_map,
-            length_map
-        )
+        if self.workers > 1:
+            best_ratio, best_path = self._best_path_ratio_parallel(
+                start_node,
+                self.T_max,
+                neighbors_map,
+                time_map,
+                snow_map,
+                importance_map,
+                length_map
+            )
+        else:
+            best_ratio, best_path = self._best_path_ratio(
+                start_node,
+                self.T_max,
+                neighbors_map,
+                time_map,
+                snow_map,
+                importance_map,
+                length_map
+            )
         
         # The next node is the second node in the best path (first is current node)
+        fallback_edge = None
         if len(best_path) < 2:
-            # Fallback: if no good path found, just pick first neighbor
-            next_node = neighbors_map[start_node][0][0]
+            # Fallback: no snow within the horizon, head toward the snowiest edge
+            next_node, fallback_edge = self._fallback_node(graph, start_node, neighbors_map, time_map)
         else:
             next_node = best_path[1]
         
@@ -91,7 +139,9 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
             "best_path": best_path,
             "best_ratio": best_ratio,
             "T_max": self.T_max,
-            "path_length": len(best_path)
+            "path_length": len(best_path),
+            "workers": self.workers,
+            "fallback_edge": fallback_edge
         }
         
         return next_node, debug_info
@@ -113,46 +163,62 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
             - importance_map: Dict[edge_id, importance]
             - length_map: Dict[edge_id, length_in_meters]
         """
-        neighbors_map: Dict[str, List[Tuple[str, str]]] = {}
-        edge_map: Dict[Tuple[str, str], str] = {}
-        time_map: Dict[str, float] = {}
-        snow_map: Dict[str, float] = {}
-        importance_map: Dict[str, float] = {}
-        length_map: Dict[str, float] = {}
+        # Everything but snow comes from the graph's topology, which is
+        # cached between requests. The search only reads these maps.
+        topology = graph.topology
         
-        # Get all edges from the graph by accessing the internal structure
-        # Note: This is a bit hacky, but we need access to edges
-        # In a production system, we'd add a get_edges() method to GraphState
-        edges = self._get_edges_from_graph(graph)
+        # Use the graph's current snow depths (defensive against negative values)
+        snow_map = {edge_id: max(0.0, depth) for edge_id, depth in graph.get_snow_depths().items()}
         
-        for edge in edges:
-            # Use edge travel_time for path planning
-            time_map[edge.id] = edge.travel_time
-            
-            # Use actual snow depth from edge (defensive against negative values)
-            snow_map[edge.id] = max(0.0, edge.snow_depth)
-            
-            # Use default importance (could be extended to come from edge attributes)
-            importance_map[edge.id] = self.default_importance
-            
-            # Store edge length in meters for reward calculation
-            length_map[edge.id] = edge.length
-            
-            # Build bidirectional neighbor map (undirected graph)
-            if edge.from_node not in neighbors_map:
-                neighbors_map[edge.from_node] = []
-            if edge.to_node not in neighbors_map:
-                neighbors_map[edge.to_node] = []
-            
-            neighbors_map[edge.from_node].append((edge.to_node, edge.id))
-            neighbors_map[edge.to_node].append((edge.from_node, edge.id))
-            
-            # Build edge lookup map
-            edge_map[(edge.from_node, edge.to_node)] = edge.id
-            edge_map[(edge.to_node, edge.from_node)] = edge.id
+        # Use default importance (could be extended to come from edge attributes)
+        importance_map = dict.fromkeys(topology.edge_ids, self.default_importance)
+        
+        neighbors_map = topology.incidence
+        edge_map = topology.edge_lookup
+        time_map = topology.travel_times
+        length_map = topology.lengths
         
         return neighbors_map, edge_map, time_map, snow_map, importance_map, length_map
     
+    def _fallback_node(
+        self,
+        graph: GraphState,
+        start_node: str,
+        neighbors: Dict[str, List[Tuple[str, str]]],
+        time: Dict[str, float]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Pick a neighbor when no rewarding path fits within the horizon.
+        
+        Takes the first hop of the fastest route (by travel time) to the
+        highest-reward edge reachable from the current node, or the first
+        neighbor if no snow is reachable.
+        
+        Returns:
+            A tuple of (next_node, target_edge_id or None)
+        """
+        dist, first_hop = _shortest_paths(start_node, neighbors, time)
+        
+        # Walk down the reward ranking until an edge in this component turns up
+        k = 1
+        checked = 0
+        while True:
+            top = graph.reward_index.top_k(k)
+            for edge_id, _ in top[checked:]:
+                edge = graph.get_edge(edge_id)
+                if start_node in (edge.from_node, edge.to_node):
+                    # Already at the edge (it just doesn't fit in the horizon)
+                    other = edge.to_node if edge.from_node == start_node else edge.from_node
+                    return other, edge_id
+                reachable = [n for n in (edge.from_node, edge.to_node) if n in dist]
+                if reachable:
+                    nearest = min(reachable, key=lambda n: dist[n])
+                    return first_hop[nearest], edge_id
+            if len(top) < k:
+                return neighbors[start_node][0][0], None
+            checked = len(top)
+            k *= 2
+    
     def _get_edges_from_graph(self, graph: GraphState) -> List[Edge]:
         """
         Extract edges from the GraphState.
@@ -186,6 +252,7 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
         """
         best_ratio = 0.0
         best_path = [start_node]
+        max_edge_ratio = _max_edge_ratio(time, snow, importance, length)
         
         def dfs(node: str, time_used: float, reward: float, used_edges: Set[str], path: List[str]):
             nonlocal best_ratio, best_path
@@ -201,6 +268,11 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
             if time_used >= T_max:
                 return
             
+            # Stop if no extension of this path can beat the best ratio
+            bound = _ratio_upper_bound(time_used, reward, T_max, max_edge_ratio)
+            if bound * (1 + _PRUNE_SLACK) < best_ratio:
+                return
+            
             # Try extending the path by one more edge
             for (nbr, edge_id) in neighbors.get(node, []):
                 t_e = time[edge_id]
@@ -232,4 +304,506 @@ class FiniteHorizonGreedyPolicy(BasePolicy):
         dfs(start_node, 0.0, 0.0, set(), [start_node])
         
         return best_ratio, best_path
+    
+    def _best_path_ratio_parallel(
+        self,
+        start_node: str,
+        T_max: float,
+        neighbors: Dict[str, List[Tuple[str, str]]],
+        time: Dict[str, float],
+        snow: Dict[str, float],
+        importance: Dict[str, float],
+        length: Dict[str, float]
+    ) -> Tuple[float, List[str]]:
+        """
+        Parallel version of _best_path_ratio with the same result.
+        
+        The tree is split at the shallowest depth that yields tasks_per_worker
+        subtrees per worker. Paths above the split are scored here; the
+        subtrees are searched in DFS order in-process until parallel_min_nodes
+        DFS nodes have been visited, so short searches never pay for
+        inter-process communication and longer ones keep the work done so far.
+        The remaining subtrees go to the worker pool. Results are merged in
+        serial DFS order with the same strict ">" comparison, so ties resolve
+        to the same path as the serial search.
+        
+        Falls back to the serial search when the tree is too small to split,
+        and to in-process search when worker processes are unavailable.
+        """
+        candidates, tasks = _split_search(
+            start_node, T_max, self.workers * self.tasks_per_worker,
+            neighbors, time, snow, importance, length
+        )
+        if len(tasks) < 2:
+            return self._best_path_ratio(start_node, T_max, neighbors, time, snow, importance, length)
+        
+        max_edge_ratio = _max_edge_ratio(time, snow, importance, length)
+        results = list(candidates)
+        
+        # Seed the incumbent with the shallow candidates so subtrees can
+        # prune from the start
+        incumbent = max((ratio for _, ratio, _ in candidates), default=0.0)
+        
+        def read_incumbent() -> float:
+            return incumbent
+        
+        def publish(ratio: float):
+            nonlocal incumbent
+            incumbent = max(incumbent, ratio)
+        
+        budget = self.parallel_min_nodes
+        next_task = 0
+        while next_task < len(tasks):
+            order, task = tasks[next_task]
+            try:
+                ratio, path, visited = _search_prefix(
+                    task, T_max, max_edge_ratio, neighbors, time, snow, importance, length,
+                    read_incumbent, publish, node_budget=budget
+                )
+            except _SearchBudgetExceeded:
+                break
+            results.append((order, ratio, path))
+            budget -= visited
+            next_task += 1
+        
+        remaining = tasks[next_task:]
+        if remaining:
+            remaining_results = self._search_in_pool(
+                remaining, incumbent, T_max, max_edge_ratio, neighbors, time, snow, importance, length
+            )
+            if remaining_results is None:
+                # No worker pool available, finish in-process
+                remaining_results = [
+                    _search_prefix(
+                        task, T_max, max_edge_ratio, neighbors, time, snow, importance, length,
+                        read_incumbent, publish
+                    )[:2]
+                    for _, task in remaining
+                ]
+            results += [
+                (order, ratio, path) for (order, _), (ratio, path) in zip(remaining, remaining_results)
+            ]
+        
+        results.sort(key=lambda result: result[0])
+        
+        best_ratio = 0.0
+        best_path = [start_node]
+        for _, ratio, path in results:
+            if path is not None and ratio > best_ratio:
+                best_ratio = ratio
+                best_path = path
+        
+        return best_ratio, best_path
+    
+    def _search_in_pool(
+        self,
+        tasks: List[Tuple[int, Tuple]],
+        seed: float,
+        T_max: float,
+        max_edge_ratio: float,
+        neighbors: Dict[str, List[Tuple[str, str]]],
+        time: Dict[str, float],
+        snow: Dict[str, float],
+        importance: Dict[str, float],
+        length: Dict[str, float]
+    ) -> Optional[List[Tuple[float, Optional[List[str]]]]]:
+        """
+        Search subtree tasks in the worker pool.
+        
+        Returns:
+            (best_ratio, best_path) per task in task order, or None when worker
+            processes are unavailable
+        """
+        # Workers load the graph from a file once and keep it until a search
+        # on a different graph comes along
+        graph_data = pickle.dumps(
+            (T_max, max_edge_ratio, neighbors, time, snow, importance, length),
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        graph_token = hashlib.sha1(graph_data).hexdigest()
+        
+        try:
+            pool = _get_pool(self.workers)
+            fd, graph_path = tempfile.mkstemp(prefix="snowplow-search-", suffix=".pickle")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(graph_data)
+                
+                # Each concurrent search gets its own incumbent slot
+                slot = pool.free_slots.get()
+                try:
+                    pool.incumbents[slot] = max(0.0, seed)
+                    return list(pool.executor.map(
+                        _search_subtree,
+                        [(graph_token, graph_path, slot, task) for _, task in tasks]
+                    ))
+                finally:
+                    pool.free_slots.put(slot)
+            finally:
+                os.remove(graph_path)
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # e.g. serverless runtimes without /dev/shm or process spawning
+            _discard_pool(self.workers)
+            return None
+
+
+def _shortest_paths(
+    start_node: str,
+    neighbors: Dict[str, List[Tuple[str, str]]],
+    time: Dict[str, float]
+) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """
+    Dijkstra by travel time from start_node.
+    
+    Returns:
+        A tuple of (dist, first_hop)
+        - dist: Dict mapping each reachable node to its travel time from start_node
+        - first_hop: Dict mapping each reachable node other than start_node to
+          the neighbor of start_node its fastest route goes through
+    """
+    dist: Dict[str, float] = {start_node: 0.0}
+    first_hop: Dict[str, str] = {}
+    done: Set[str] = set()
+    # (distance, insertion order, node, first hop); the counter keeps ties deterministic
+    queue = [(0.0, 0, start_node, None)]
+    counter = 1
+    
+    while queue:
+        d, _, node, hop = heapq.heappop(queue)
+        if node in done:
+            continue
+        done.add(node)
+        if hop is not None:
+            first_hop[node] = hop
+        
+        for (nbr, edge_id) in neighbors.get(node, []):
+            new_dist = d + time[edge_id]
+            if nbr not in done and new_dist < dist.get(nbr, math.inf):
+                dist[nbr] = new_dist
+                heapq.heappush(queue, (new_dist, counter, nbr, nbr if hop is None else hop))
+                counter += 1
+    
+    return dist, first_hop
+
+
+class _SearchBudgetExceeded(Exception):
+    """Raised by _search_prefix when the search outgrows its node budget."""
+
+
+# Relative slack applied to the pruning bound so floating point rounding can
+# never prune a path that the serial search would have picked
+_PRUNE_SLACK = 1e-9
+
+# Number of DFS nodes a subtree search visits between reads of the shared incumbent
+_SHARED_REFRESH_INTERVAL = 1024
 
+# Per-process search state, populated by _init_search_worker
+_worker_state: Dict = {}
+
+# Number of searches per process that can use a worker pool at the same time
+_INCUMBENT_SLOTS = 32
+
+# Deepest split tried when looking for enough subtrees
+_MAX_SPLIT_DEPTH = 12
+
+
+class _SearchPool:
+    """Worker processes plus one shared incumbent slot per concurrent search."""
+    
+    def __init__(self, workers: int):
+        # Workers are spawned rather than forked since uvicorn serves requests
+        # from a thread pool
+        ctx = multiprocessing.get_context("spawn")
+        self.incumbents = ctx.Array("d", _INCUMBENT_SLOTS)
+        self.free_slots: queue.Queue = queue.Queue()
+        for slot in range(_INCUMBENT_SLOTS):
+            self.free_slots.put(slot)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_search_worker,
+            initargs=(self.incumbents,)
+        )
+
+
+# Long-lived worker pools of this process, keyed by worker count
+_pools: Dict[int, _SearchPool] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> _SearchPool:
+    """Get the worker pool for a worker count, creating it on first use."""
+    with _pool_lock:
+        if workers not in _pools:
+            _pools[workers] = _SearchPool(workers)
+        return _pools[workers]
+
+
+def _discard_pool(workers: int):
+    """Shut down a broken or unusable pool so the next search starts afresh."""
+    with _pool_lock:
+        pool = _pools.pop(workers, None)
+    if pool is not None:
+        pool.executor.shutdown(wait=False)
+
+
+def _split_search(
+    start_node: str,
+    T_max: float,
+    min_tasks: int,
+    neighbors: Dict[str, List[Tuple[str, str]]],
+    time: Dict[str, float],
+    snow: Dict[str, float],
+    importance: Dict[str, float],
+    length: Dict[str, float]
+) -> Tuple[List[Tuple[int, float, List[str]]], List[Tuple[int, Tuple]]]:
+    """
+    Split the search tree at the shallowest depth giving at least min_tasks subtrees.
+    
+    Stops early at _MAX_SPLIT_DEPTH or when the tree has no paths left that
+    deep. See _split_at_depth for the return value.
+    """
+    for depth in range(1, _MAX_SPLIT_DEPTH + 1):
+        candidates, tasks = _split_at_depth(
+            start_node, T_max, depth, neighbors, time, snow, importance, length
+        )
+        if len(tasks) >= min_tasks or not tasks:
+            break
+    return candidates, tasks
+
+
+def _split_at_depth(
+    start_node: str,
+    T_max: float,
+    split_depth: int,
+    neighbors: Dict[str, List[Tuple[str, str]]],
+    time: Dict[str, float],
+    snow: Dict[str, float],
+    importance: Dict[str, float],
+    length: Dict[str, float]
+) -> Tuple[List[Tuple[int, float, List[str]]], List[Tuple[int, Tuple]]]:
+    """
+    Expand the search tree down to split_depth in serial DFS order.
+    
+    Returns:
+        A tuple of (candidates, tasks)
+        - candidates: (order, ratio, path) for every path shorter than split_depth
+        - tasks: (order, (path, time_used, reward, used_edges)) for every path
+          prefix of exactly split_depth hops, whose subtree is searched separately
+    """
+    candidates: List[Tuple[int, float, List[str]]] = []
+    tasks: List[Tuple[int, Tuple]] = []
+    
+    def expand(node: str, time_used: float, reward: float, used_edges: Set[str], path: List[str]):
+        order = len(candidates) + len(tasks)
+        depth = len(path) - 1
+        
+        if depth == split_depth:
+            tasks.append((order, (path.copy(), time_used, reward, frozenset(used_edges))))
+            return
+        
+        if time_used > 0:
+            candidates.append((order, reward / time_used, path.copy()))
+        
+        if time_used >= T_max:
+            return
+        
+        # Same expansion rules as the serial DFS in _best_path_ratio
+        for (nbr, edge_id) in neighbors.get(node, []):
+            new_time = time_used + time[edge_id]
+            if new_time > T_max:
+                continue
+            
+            if edge_id in used_edges:
+                extra_reward = 0.0
+            else:
+                extra_reward = importance[edge_id] * snow[edge_id] * length[edge_id]
+            
+            added = False
+            if extra_reward > 0:
+                used_edges.add(edge_id)
+                added = True
+            
+            path.append(nbr)
+            expand(nbr, new_time, reward + extra_reward, used_edges, path)
+            path.pop()
+            
+            if added:
+                used_edges.remove(edge_id)
+    
+    expand(start_node, 0.0, 0.0, set(), [start_node])
+    
+    return candidates, tasks
+
+
+def _max_edge_ratio(
+    time: Dict[str, float],
+    snow: Dict[str, float],
+    importance: Dict[str, float],
+    length: Dict[str, float]
+) -> float:
+    """
+    Highest reward-to-time ratio of any single edge in the graph.
+    
+    No path can gain reward faster than this, which gives the upper bound
+    used for pruning in the parallel search.
+    """
+    best = 0.0
+    for edge_id, t_e in time.items():
+        reward = importance[edge_id] * snow[edge_id] * length[edge_id]
+        if reward <= 0:
+            continue
+        if t_e <= 0:
+            return math.inf
+        best = max(best, reward / t_e)
+    return best
+
+
+def _ratio_upper_bound(time_used: float, reward: float, T_max: float, max_edge_ratio: float) -> float:
+    """
+    Upper bound on the ratio of any extension of a path.
+    
+    Extending by time tau adds at most tau * max_edge_ratio reward. When that
+    beats the current ratio, (reward + tau * r) / (time_used + tau) grows with
+    tau, so the bound is reached by spending the whole remaining budget.
+    """
+    if time_used <= 0 or math.isinf(max_edge_ratio):
+        return math.inf
+    current = reward / time_used
+    if max_edge_ratio <= current:
+        return current
+    return (reward + (T_max - time_used) * max_edge_ratio) / T_max
+
+
+def _init_search_worker(incumbents):
+    """Store the shared incumbent slots in the worker process."""
+    _worker_state["incumbents"] = incumbents
+    _worker_state["graph_token"] = None
+
+
+def _load_worker_graph(graph_token: str, graph_path: str):
+    """Load the graph data for a search unless this worker already has it."""
+    if _worker_state["graph_token"] != graph_token:
+        with open(graph_path, "rb") as f:
+            _worker_state["graph"] = pickle.load(f)
+        _worker_state["graph_token"] = graph_token
+
+
+def _search_subtree(job: Tuple) -> Tuple[float, Optional[List[str]]]:
+    """
+    Search the subtree below one path prefix in a worker process.
+    
+    Returns:
+        A tuple of (best_ratio, best_path); best_path is None when no path in
+        the subtree has a positive ratio
+    """
+    graph_token, graph_path, slot, task = job
+    _load_worker_graph(graph_token, graph_path)
+    incumbents = _worker_state["incumbents"]
+    
+    def read_incumbent() -> float:
+        return incumbents[slot]
+    
+    def publish(ratio: float):
+        with incumbents.get_lock():
+            if ratio > incumbents[slot]:
+                incumbents[slot] = ratio
+    
+    best_ratio, best_path, _ = _search_prefix(task, *_worker_state["graph"], read_incumbent, publish)
+    return best_ratio, best_path
+
+
+def _search_prefix(
+    task: Tuple,
+    T_max: float,
+    max_edge_ratio: float,
+    neighbors: Dict[str, List[Tuple[str, str]]],
+    time: Dict[str, float],
+    snow: Dict[str, float],
+    importance: Dict[str, float],
+    length: Dict[str, float],
+    read_incumbent: Callable[[], float],
+    publish: Callable[[float], None],
+    node_budget: Optional[int] = None
+) -> Tuple[float, Optional[List[str]], int]:
+    """
+    Search the subtree below one path prefix.
+    
+    Mirrors the DFS in _best_path_ratio, but starts from a prefix and prunes
+    subtrees whose ratio bound is strictly below the best ratio known in this
+    task or published by any other subtree search.
+    
+    Args:
+        task: (path, time_used, reward, used_edges) of the prefix
+        read_incumbent: Returns the best ratio published by any subtree search
+        publish: Called with every improvement of this task's best ratio
+        node_budget: Maximum number of DFS nodes to visit (None for no limit)
+    
+    Returns:
+        A tuple of (best_ratio, best_path, visited); best_path is None when no
+        path in the subtree has a positive ratio
+        
+    Raises:
+        _SearchBudgetExceeded: If the search visits more than node_budget nodes
+    """
+    prefix, start_time, start_reward, start_used = task
+    
+    best_ratio = 0.0
+    best_path: Optional[List[str]] = None
+    incumbent = read_incumbent()
+    visited = 0
+    
+    def dfs(node: str, time_used: float, reward: float, used_edges: Set[str], path: List[str]):
+        nonlocal best_ratio, best_path, incumbent, visited
+        
+        visited += 1
+        if node_budget is not None and visited > node_budget:
+            raise _SearchBudgetExceeded()
+        if visited % _SHARED_REFRESH_INTERVAL == 0:
+            incumbent = max(incumbent, read_incumbent())
+        
+        if time_used > 0:
+            ratio = reward / time_used
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_path = path.copy()
+                if ratio > incumbent:
+                    incumbent = ratio
+                    publish(ratio)
+        
+        if time_used >= T_max:
+            return
+        
+        # Prune only when strictly worse: an equal ratio found by a later
+        # subtree must not hide the path the serial search would return
+        bound = _ratio_upper_bound(time_used, reward, T_max, max_edge_ratio)
+        if bound * (1 + _PRUNE_SLACK) < incumbent:
+            return
+        
+        for (nbr, edge_id) in neighbors.get(node, []):
+            t_e = time[edge_id]
+            new_time = time_used + t_e
+            
+            if new_time > T_max:
+                continue
+            
+            if edge_id in used_edges:
+                extra_reward = 0.0
+            else:
+                extra_reward = importance[edge_id] * snow[edge_id] * length[edge_id]
+            
+            added = False
+            if extra_reward > 0:
+                used_edges.add(edge_id)
+                added = True
+            
+            path.append(nbr)
+            dfs(nbr, new_time, reward + extra_reward, used_edges, path)
+            path.pop()
+            
+            if added:
+                used_edges.remove(edge_id)
+    
+    dfs(prefix[-1], start_time, start_reward, set(start_used), list(prefix))
+    
+    return best_ratio, best_path, visited
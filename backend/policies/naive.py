@@ -17,6 +17,9 @@ except ImportError:
 class NaivePolicy(BasePolicy):
     """A simple policy that randomly selects a neighboring node."""
     
+    # Random choice: caching would pin every plow to the first pick
+    cacheable = False
+    
     def choose_next_node(
         self,
         graph: GraphState,
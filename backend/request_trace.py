@@ -0,0 +1,154 @@
+"""Recording and reading of /next_node request traces.
+
+A trace is a JSON Lines file (gzip-compressed when the path ends in .gz).
+The node list and the edge topology (edges without snow depths) are stored
+once as content-addressed "blob" lines and referenced by hash from each
+"request" line, since consecutive ticks of the simulator resend the same
+roads. Request lines only carry the snow depths, in edge order.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Set, TextIO, Tuple
+
+# Handle imports for both local development and Vercel deployment
+try:
+    from backend.models import NextNodeRequest
+    from backend.cache import topology_cache_key
+except ImportError:
+    from models import NextNodeRequest
+    from cache import topology_cache_key
+
+
+def _open_trace(path: str, mode: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _blob_id(data: List[Dict]) -> str:
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class TraceRecorder:
+    """Appends NextNodeRequest payloads to a trace file."""
+
+    def __init__(self, path: str):
+        """
+        Open a trace file for recording.
+
+        Args:
+            path: Trace file path. A "{pid}" placeholder is replaced with the
+                process ID so each uvicorn worker writes its own file.
+        """
+        self.path = path.replace("{pid}", str(os.getpid()))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = _open_trace(self.path, "a")
+        self._written_blobs: Set[str] = set()
+        # (nodes, topology) blob IDs by topology_cache_key, which is cheaper
+        # to compute than the canonical JSON of the blobs
+        self._topology_blobs: Dict[str, Tuple[str, str]] = {}
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, request: NextNodeRequest):
+        """
+        Append a request to the trace.
+
+        Args:
+            request: The request as received by the /next_node endpoint
+        """
+        payload = request.model_dump(mode="json", exclude={"nodes", "edges"})
+        snow = [edge.snow_depth for edge in request.edges]
+        topology_key = topology_cache_key(request.nodes, request.edges)
+
+        with self._lock:
+            lines = []
+            refs = self._topology_blobs.get(topology_key)
+            if refs is None:
+                nodes = [node.model_dump(mode="json") for node in request.nodes]
+                topology = [edge.model_dump(mode="json", exclude={"snow_depth"}) for edge in request.edges]
+                refs = (_blob_id(nodes), _blob_id(topology))
+                for blob_id, data in zip(refs, (nodes, topology)):
+                    if blob_id not in self._written_blobs:
+                        self._written_blobs.add(blob_id)
+                        lines.append({"kind": "blob", "id": blob_id, "data": data})
+                self._topology_blobs[topology_key] = refs
+
+            lines.append({
+                "kind": "request",
+                "t": round(time.monotonic() - self._start, 6),
+                "nodes": refs[0],
+                "topology": refs[1],
+                "snow": snow,
+                **payload
+            })
+            for line in lines:
+                self._file.write(json.dumps(line, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def close(self):
+        """Flush and close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+def read_trace(path: str) -> Iterator[Dict]:
+    """
+    Read the requests of a trace file in recording order.
+
+    A trace cut short by a killed recorder (a partial last line, or a gzip
+    stream without its end marker) yields the requests read up to that point.
+
+    Args:
+        path: Path to a trace written by TraceRecorder
+
+    Yields:
+        Dicts with "t" (seconds since recording started) and "payload" (the
+        JSON body of the original /next_node request)
+
+    Raises:
+        ValueError: If a request references a blob that was not recorded
+    """
+    blobs: Dict[str, List[Dict]] = {}
+    with _open_trace(path, "r") as f:
+        try:
+            for line_number, line in enumerate(f, start=1):
+                if not line.endswith("\n"):
+                    # Partial line the recorder never finished writing
+                    return
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["kind"] == "blob":
+                    blobs[entry["id"]] = entry["data"]
+                    continue
+
+                try:
+                    nodes = blobs[entry.pop("nodes")]
+                    if "topology" in entry:
+                        snow = entry.pop("snow")
+                        edges = [
+                            {**edge, "snow_depth": snow_depth}
+                            for edge, snow_depth in zip(blobs[entry.pop("topology")], snow)
+                        ]
+                    else:
+                        # Traces recorded before snow depths were split out
+                        edges = blobs[entry.pop("edges")]
+                except KeyError as e:
+                    raise ValueError(f"{path}:{line_number} references unknown blob {e}")
+
+                entry.pop("kind")
+                t = entry.pop("t")
+                yield {"t": t, "payload": {**entry, "nodes": nodes, "edges": edges}}
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            # Compressed stream cut short; keep the requests read so far
+            return
@@ -0,0 +1,228 @@
+"""Incrementally maintained index of edge rewards."""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Handle imports for both local development and Vercel deployment
+try:
+    from backend.models import Node, Edge
+except ImportError:
+    from models import Node, Edge
+
+
+Region = Tuple[int, int]
+
+
+def edge_reward(snow_depth: float, length: float) -> float:
+    """
+    Reward for clearing an edge: snow_depth * length (meters of snow cleared).
+
+    Matches the reward in FiniteHorizonGreedyPolicy._best_path_ratio with an
+    importance of 1, including clamping negative snow depths to zero.
+    """
+    return max(0.0, snow_depth) * length
+
+
+class _Partition:
+    """Lazy max-heap and running total for the edges of one region."""
+
+    __slots__ = ("heap", "total", "live")
+
+    def __init__(self):
+        # Entries are (-reward, version, edge_id); an entry is stale once the
+        # edge's version has moved on
+        self.heap: List[Tuple[float, int, str]] = []
+        self.total = 0.0
+        self.live = 0
+
+
+class RewardIndex:
+    """
+    Priority index over edge rewards, optionally partitioned into a grid.
+
+    Edges are assigned to the grid cell containing their midpoint. Each cell
+    keeps a heap of its positive-reward edges and a running reward total, and
+    the same is kept for the whole graph. Building is O(n), updating an edge
+    is O(log n), totals are O(1) and top-k queries are O(k log n) amortized.
+
+    GraphState builds the index on first use and keeps it up to date through
+    GraphState.update_snow_depth().
+    """
+
+    def __init__(
+        self,
+        nodes: Dict[str, Node],
+        edges: List[Edge],
+        cell_size: Optional[float] = None,
+        snow_depths: Optional[Dict[str, float]] = None
+    ):
+        """
+        Build the index from the current snow depths.
+
+        Args:
+            nodes: Dict mapping node_id to Node, used for edge midpoints
+            edges: List of Edge objects
+            cell_size: Grid cell size in node coordinate units; None keeps
+                all edges in a single region
+            snow_depths: Dict mapping edge_id to snow depth (None uses the
+                snow_depth of the Edge objects)
+        """
+        self.cell_size = cell_size
+        self._rewards: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._regions: Dict[str, Region] = {}
+        self._global = _Partition()
+        self._partitions: Dict[Region, _Partition] = {}
+        self._next_version = len(edges)
+
+        if cell_size is None:
+            # A single region is just the whole graph
+            self._partitions[(0, 0)] = self._global
+
+        for version, edge in enumerate(edges):
+            snow_depth = edge.snow_depth if snow_depths is None else snow_depths[edge.id]
+            reward = edge_reward(snow_depth, edge.length)
+            self._rewards[edge.id] = reward
+            self._versions[edge.id] = version
+            if cell_size is None:
+                region = (0, 0)
+            else:
+                a, b = nodes[edge.from_node], nodes[edge.to_node]
+                region = self.region_of((a.x + b.x) / 2, (a.y + b.y) / 2)
+            self._regions[edge.id] = region
+            if reward > 0:
+                entry = (-reward, version, edge.id)
+                self._global.heap.append(entry)
+                if cell_size is not None:
+                    self._partitions.setdefault(region, _Partition()).heap.append(entry)
+            elif cell_size is not None:
+                self._partitions.setdefault(region, _Partition())
+
+        for partition in set(self._partitions.values()) | {self._global}:
+            heapq.heapify(partition.heap)
+            partition.live = len(partition.heap)
+            partition.total = math.fsum(-entry[0] for entry in partition.heap)
+
+    def region_of(self, x: float, y: float) -> Region:
+        """
+        Get the region containing a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+
+        Returns:
+            The grid cell (column, row), or (0, 0) when not partitioned
+        """
+        if self.cell_size is None:
+            return (0, 0)
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def regions(self) -> List[Region]:
+        """
+        Get all regions that contain at least one edge.
+
+        Returns:
+            List of region keys
+        """
+        return list(self._partitions.keys())
+
+    def reward(self, edge_id: str) -> float:
+        """
+        Get the current reward of an edge.
+
+        Raises:
+            KeyError: If edge_id isn't indexed
+        """
+        return self._rewards[edge_id]
+
+    def update(self, edge_id: str, reward: float):
+        """
+        Set the reward of an edge.
+
+        Args:
+            edge_id: The ID of the edge
+            reward: The new reward (see edge_reward)
+
+        Raises:
+            KeyError: If edge_id isn't indexed
+            ValueError: If reward is negative
+        """
+        if reward < 0:
+            raise ValueError(f"Reward of edge {edge_id} must not be negative, got {reward}")
+        old_reward = self._rewards[edge_id]
+        self._rewards[edge_id] = reward
+        version = self._next_version
+        self._next_version += 1
+        self._versions[edge_id] = version
+
+        partitions = [self._global]
+        if self.cell_size is not None:
+            partitions.append(self._partitions[self._regions[edge_id]])
+        for partition in partitions:
+            partition.total += reward - old_reward
+            if old_reward > 0:
+                partition.live -= 1
+            if reward > 0:
+                partition.live += 1
+                heapq.heappush(partition.heap, (-reward, version, edge_id))
+            # Drop stale entries once they outnumber the live ones
+            if len(partition.heap) > 2 * partition.live + 16:
+                self._compact(partition)
+
+    def top_k(self, k: int, region: Optional[Region] = None) -> List[Tuple[str, float]]:
+        """
+        Get the k edges with the highest positive reward.
+
+        Args:
+            k: Maximum number of edges to return
+            region: Only consider edges in this region (None for the whole graph)
+
+        Returns:
+            List of (edge_id, reward) in descending reward order; ties keep
+            the order in which the rewards were set
+        """
+        partition = self._partition(region)
+        if partition is None:
+            return []
+
+        heap = partition.heap
+        found: List[Tuple[float, int, str]] = []
+        while heap and len(found) < k:
+            entry = heapq.heappop(heap)
+            if self._versions[entry[2]] == entry[1]:
+                found.append(entry)
+        # Stale entries popped above are gone for good; put back the live ones
+        for entry in found:
+            heapq.heappush(heap, entry)
+
+        return [(edge_id, -neg_reward) for neg_reward, _, edge_id in found]
+
+    def total_reward(self, region: Optional[Region] = None) -> float:
+        """
+        Get the total reward of all edges.
+
+        Args:
+            region: Only sum edges in this region (None for the whole graph)
+
+        Returns:
+            The total reward
+        """
+        partition = self._partition(region)
+        if partition is None:
+            return 0.0
+        return partition.total
+
+    def _partition(self, region: Optional[Region]) -> Optional[_Partition]:
+        if region is None:
+            return self._global
+        return self._partitions.get(region)
+
+    def _compact(self, partition: _Partition):
+        partition.heap = [
+            entry for entry in partition.heap if self._versions[entry[2]] == entry[1]
+        ]
+        heapq.heapify(partition.heap)
+        # Resum from scratch so incremental updates don't accumulate rounding error
+        partition.total = math.fsum(-entry[0] for entry in partition.heap)
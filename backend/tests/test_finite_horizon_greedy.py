@@ -0,0 +1,89 @@
+"""Equivalence of the pruned and parallel finite horizon searches with a plain DFS."""
+
+import random
+from typing import Dict, List, Set, Tuple
+
+import pytest
+
+from backend.graph import GraphState
+from backend.models import Edge, Node, PlowState
+from backend.policies.finite_horizon_greedy import FiniteHorizonGreedyPolicy
+
+
+def _grid_graph(seed: int, size: int = 4) -> GraphState:
+    """Grid graph with a few repeated snow depths, so equal ratios are common."""
+    rnd = random.Random(seed)
+    nodes = [Node(id=f"n{i}_{j}", x=i, y=j) for i in range(size) for j in range(size)]
+    edges = []
+    for i in range(size):
+        for j in range(size):
+            for di, dj in ((1, 0), (0, 1)):
+                if i + di < size and j + dj < size:
+                    edges.append(Edge(
+                        id=f"e{len(edges)}",
+                        from_node=f"n{i}_{j}",
+                        to_node=f"n{i + di}_{j + dj}",
+                        travel_time=rnd.choice([5.0, 10.0]),
+                        length=rnd.choice([50.0, 100.0]),
+                        snow_depth=rnd.choice([0.0, 0.0, 1.0, 2.0])
+                    ))
+    return GraphState(nodes, edges)
+
+
+def _reference_search(
+    start_node: str,
+    T_max: float,
+    neighbors: Dict[str, List[Tuple[str, str]]],
+    time: Dict[str, float],
+    snow: Dict[str, float],
+    importance: Dict[str, float],
+    length: Dict[str, float]
+) -> Tuple[float, List[str]]:
+    """The exhaustive DFS the policy started out with, without any pruning."""
+    best_ratio = 0.0
+    best_path = [start_node]
+
+    def dfs(node: str, time_used: float, reward: float, used_edges: Set[str], path: List[str]):
+        nonlocal best_ratio, best_path
+        if time_used > 0 and reward / time_used > best_ratio:
+            best_ratio = reward / time_used
+            best_path = path.copy()
+        if time_used >= T_max:
+            return
+        for (nbr, edge_id) in neighbors.get(node, []):
+            new_time = time_used + time[edge_id]
+            if new_time > T_max:
+                continue
+            extra_reward = 0.0 if edge_id in used_edges else importance[edge_id] * snow[edge_id] * length[edge_id]
+            added = extra_reward > 0
+            if added:
+                used_edges.add(edge_id)
+            path.append(nbr)
+            dfs(nbr, new_time, reward + extra_reward, used_edges, path)
+            path.pop()
+            if added:
+                used_edges.remove(edge_id)
+
+    dfs(start_node, 0.0, 0.0, set(), [start_node])
+    return best_ratio, best_path
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("T_max", [20.0, 45.0])
+def test_searches_match_reference(seed: int, T_max: float):
+    graph = _grid_graph(seed)
+    start = PlowState(current_node_id="n1_1")
+    reference_policy = FiniteHorizonGreedyPolicy(T_max=T_max)
+    neighbors, _, time, snow, importance, length = reference_policy._build_graph_data(graph, None)
+    expected = _reference_search("n1_1", T_max, neighbors, time, snow, importance, length)
+
+    policies = [
+        FiniteHorizonGreedyPolicy(T_max=T_max),
+        # Everything in the worker pool
+        FiniteHorizonGreedyPolicy(T_max=T_max, workers=2, parallel_min_nodes=0),
+        # Some subtrees in-process, the rest in the pool
+        FiniteHorizonGreedyPolicy(T_max=T_max, workers=2, tasks_per_worker=3, parallel_min_nodes=200),
+    ]
+    for policy in policies:
+        _, debug = policy.choose_next_node(graph, start, None)
+        assert (debug["best_ratio"], debug["best_path"]) == expected